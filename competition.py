@@ -1,104 +1,162 @@
 #!/usr/bin/env python3
 
+import functools
+import operator
 import os
-from glob import glob
-from dataclasses import dataclass
-
-glob_file_name = "my_results"
-directory_patterns = [
-    "/home/*/*",
-    "/home/*",
-]
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+results_file_name = "my_results"
+
 def get_user(file_name):
-    # assumes a /home/<user>/... file_name pattern
-    return file_name.split("/")[2]
+    # assumes a /home/<user>/... file_name pattern; partition stops at the
+    # first separator instead of splitting the whole path into segments, and
+    # interning dedupes the name when a user shows up under several patterns
+    return sys.intern(file_name[len("/home/"):].partition("/")[0])
 
 def get_file_names():
-    return [ # flatten the files from all the directory_patterns
-        file_name
-        for directory_pattern in directory_patterns
-        for file_name in glob(
-            f"{directory_pattern}/{glob_file_name}",
-            recursive = True,
-        )
-    ]
+    # equivalent to globbing /home/*/*/my_results and /home/*/my_results, but
+    # only the user (and project) segments are wildcards, so one scandir per
+    # directory plus a direct check of the literal my_results suffix avoids
+    # listing and pattern-filtering directories we then throw away
+    file_names = []
+    try:
+        user_entries = os.scandir("/home")
+    except FileNotFoundError:
+        return file_names
+
+    # one pass: each user directory is visited exactly once and yields both
+    # its /home/*/my_results and /home/*/*/my_results candidates (the table
+    # is sorted before printing, so pattern-grouped ordering is irrelevant);
+    # the DirEntry type info comes with the listing, so a /home/*/my_results
+    # hit and the is-this-a-project-directory check cost no extra stat
+    with user_entries:
+        for user_entry in user_entries:
+            if user_entry.name.startswith(".") or not user_entry.is_dir():
+                continue
+            try:
+                child_entries = os.scandir(user_entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with child_entries:
+                for child_entry in child_entries:
+                    if child_entry.name == results_file_name:
+                        if child_entry.is_file():
+                            file_names.append(child_entry.path)
+                    elif not child_entry.name.startswith(".") and child_entry.is_dir():
+                        file_name = os.path.join(child_entry.path, results_file_name)
+                        # lexists is a bare lstat: for the common miss it is
+                        # the cheapest way to rule out the open(), and for a
+                        # hit it matches the old glob, which also only
+                        # checked existence
+                        if os.path.lexists(file_name):
+                            file_names.append(file_name)
+    return file_names
+
+GiB = 1024 ** 3
 
-@dataclass
+@functools.lru_cache(maxsize = 8)
+def _compile_formats(format_code):
+    # one closure per field, with the "G" suffix branch resolved here instead
+    # of on every printed row; empty specs compile to None and are skipped
+    formatters = []
+    for format in format_code.split(","):
+        if format.endswith("G"):
+            def formatter(value, format = format[:-1]):
+                # the f-string formats and appends the unit in one pass
+                return f"{value / GiB:{format}} GiB/s"
+        elif format:
+            def formatter(value, format = format):
+                return f"{value:{format}}"
+        else:
+            formatter = None
+        formatters.append(formatter)
+    return tuple(formatters)
+
+@dataclass(slots = True)
 class Results:
     user: str
     fast_result: int
     safe_result: int
     inner_throughput: float
     outer_throughput: float
+    correct: bool = field(init = False)
+
+    def __post_init__(self):
+        # plain int equality, evaluated once at construction instead of per
+        # check; stored in a slot like the other fields
+        self.correct = self.fast_result == self.safe_result
 
     def from_file_name(file_name):
         user = get_user(file_name)
-        with open(file_name, "r") as file:
-            lines = filter(len, file.read().split("\n"))
-            try:
-                fast_result, safe_result, inner_throughput, outer_throughput = lines
-                return Results(
-                    user,
-                    int(fast_result),
-                    int(safe_result),
-                    float(inner_throughput),
-                    float(outer_throughput),
-                )
-            except Exception as e:
-                print(f"could not read results file\n  {file_name!r}\n  {e!r}")
-                return Results(user, 0, 0, 0, 0)
-
-    def format(value, format):
-        Gibi = format.endswith("G")
-        if Gibi:
-            value /= 1024 ** 3
-            format = format[:-1]
-
-        result = value.__format__(format)
-        if Gibi:
-            result += " GiB/s"
-        return result
-
-    def __iter__(self):
-        yield self.user
-        yield self.fast_result
-        yield self.safe_result
-        yield self.inner_throughput
-        yield self.outer_throughput
+        try:
+            # read_bytes pulls the file in one raw chunked read with no
+            # TextIOWrapper at all; the four lines are decoded in a single
+            # call. Inside the try so a file that vanished (or a dangling
+            # symlink the lexists screen let through) degrades to a zero row
+            text = Path(file_name).read_bytes().decode("ascii", "replace")
+            # rstrip + split gives the four lines as a plain list, with no
+            # filter object or per-element dispatch in between
+            fast_result, safe_result, inner_throughput, outer_throughput = \
+                text.rstrip().split("\n")
+            return Results(
+                user,
+                int(fast_result),
+                int(safe_result),
+                float(inner_throughput),
+                float(outer_throughput),
+            )
+        except Exception as e:
+            # one stderr write keeps the diagnostic out of the table output
+            # and atomic even when pool threads report concurrently
+            sys.stderr.write(
+                f"could not read results file\n  {file_name!r}\n  {e!r}\n")
+            return Results(user, 0, 0, 0, 0)
 
     def __format__(self, format_code):
-        values = tuple(self)
-        formats = format_code.split(",")
-        assert len(values) == len(formats)
+        values = (
+            self.user,
+            self.fast_result,
+            self.safe_result,
+            self.inner_throughput,
+            self.outer_throughput,
+        )
+        formatters = _compile_formats(format_code)
+        assert len(values) == len(formatters)
 
         return "".join(
-            Results.format(value, format)
-            for value, format in zip(values, formats)
-            if format
+            formatter(value)
+            for value, formatter in zip(values, formatters)
+            if formatter
         )
 
-    def correct(self):
-        return self.fast_result == self.safe_result
-
 def get_table(file_names):
-    return [
-        Results.from_file_name(file_name)
-        for file_name in file_names
-    ]
+    if not file_names:
+        return []
+    # reading the tiny results files is latency-bound (think NFS homes), and
+    # the GIL is released while they are read, so a thread pool overlaps the
+    # round-trips; map keeps the file_names ordering
+    with ThreadPoolExecutor(max_workers = min(32, len(file_names))) as executor:
+        return list(executor.map(Results.from_file_name, file_names))
 
 def main():
     table = get_table(get_file_names())
     check = " ok "
     result = Results("user", "fast", "safe", "throughput", "")
-    print(    f"{check}{result:20,,,>14,}")
+    lines = [f"{check}{result:20,,,>14,}"]
     sorted_table = sorted(
         table,
-        key = lambda result: result.outer_throughput,
+        key = operator.attrgetter("outer_throughput"),
         reverse = True,
     )
     for result in sorted_table:
-        check = " :) " if result.correct() else " :( "
-        print(f"{check}{result:20,,, 8.3fG,}")
+        check = " :) " if result.correct else " :( "
+        lines.append(f"{check}{result:20,,, 8.3fG,}")
+    lines.append("") # trailing newline
+    # one write flushes the whole table instead of a syscall per row
+    sys.stdout.write("\n".join(lines))
 
 if __name__ == "__main__":
     main()
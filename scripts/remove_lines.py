@@ -13,37 +13,50 @@ it will remove any of the requested lines that exist and write back the file.
 
 import argparse
 import re
-import shutil
 import sys
 from pathlib import Path
 
+# accepts "[45,200]", "45,200", "45 200", ...
+NUMBER_PATTERN = re.compile(r"\d+")
+
 
 def remove_lines(path: Path, line_numbers, backup=True):
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    # read all lines
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines(keepends=True)
-
-    # convert 1-based line_numbers to 0-based indices and sort descending to remove safely
-    indices = sorted({n - 1 for n in line_numbers if n >= 1}, reverse=True)
+    wanted = {n for n in line_numbers if n >= 1}
 
-    # optional backup
+    # stream line-by-line into a sibling temp file instead of loading the
+    # whole file and splicing a list; only the kept lines are ever written
+    removed = []
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(path, encoding="utf-8") as src, \
+             open(tmp, "w", encoding="utf-8") as dst:
+            for number, line in enumerate(src, start=1):
+                if number in wanted:
+                    removed.append((number, line))
+                else:
+                    dst.write(line)
+        # the temp file was created with umask defaults; carry the source
+        # mode over before it replaces the original
+        tmp.chmod(path.stat().st_mode)
+    except BaseException:
+        # don't leave a stray .tmp behind if the copy phase fails mid-stream
+        tmp.unlink(missing_ok=True)
+        raise
+
+    missing = wanted - {number for number, _ in removed}
+    for number in sorted(missing):
+        print(f"Note: file has no line {number}; skipping")
+
+    # the rename-based backup keeps the original bytes without a second copy
     if backup:
         bak = path.with_suffix(path.suffix + ".bak")
-        shutil.copy2(path, bak)
+        path.replace(bak)
         print(f"Backup written to: {bak}")
 
-    removed = []
-    for idx in indices:
-        if 0 <= idx < len(lines):
-            removed.append((idx + 1, lines[idx]))
-            del lines[idx]
-        else:
-            print(f"Note: file has no line {idx + 1}; skipping")
-
-    path.write_text(''.join(lines), encoding="utf-8")
+    tmp.replace(path)
 
     return removed
 
@@ -58,9 +71,8 @@ def main():
 
     target = args.file
 
-    # parse lines argument: accept formats like "[45,200]", "45,200", "45 200"
     lines_arg = args.lines
-    nums = re.findall(r"\d+", lines_arg)
+    nums = NUMBER_PATTERN.findall(lines_arg)
     if not nums:
         print(f"No valid line numbers found in --lines '{lines_arg}'", file=sys.stderr)
         sys.exit(2)